@@ -9,13 +9,18 @@ to respect API limits (10 requests per minute).
 import sys
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+import requests
+from requests.adapters import HTTPAdapter
+
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from evals.evaluator import MealPlanEvaluator, TestCase, EvalCategory
+from evals.rate_limiter import RateLimiter
 
 
 def create_minimal_test_cases():
@@ -84,82 +89,138 @@ def create_minimal_test_cases():
     ]
 
 
+# Most first messages get a clarifying question back; tests answer them like
+# the full evaluator does until the app gives its final response
+MAX_TURNS = 5
+FOLLOW_UP_REPLY = "I'm flexible with that."
+
+
+def compile_expected_output(expected_output):
+    """Turn a test case's expected output into a validator of the final response, once, up front"""
+    checks = []
+    
+    expected_data = expected_output.get("structured_data")
+    if expected_data or expected_output.get("meal_plan_requirements"):
+        def check_meal_plan(response):
+            return response.get("type") == "meal_plan" and bool(response.get("meal_plan"))
+        
+        checks.append(check_meal_plan)
+    
+    if expected_data:
+        wanted = [
+            (field, [value.lower() for value in values])
+            for field, values in expected_data.items()
+        ]
+        
+        def check_structured_data(response):
+            data = response.get("structured_data")
+            if not data:
+                return False
+            for field, values in wanted:
+                found = " ".join(str(item) for item in data.get(field) or []).lower()
+                if not all(value in found for value in values):
+                    return False
+            return True
+        
+        checks.append(check_structured_data)
+    
+    if expected_output.get("should_reject"):
+        def check_rejected(response):
+            return response.get("type") != "meal_plan" or "rejected_info" in response
+        
+        checks.append(check_rejected)
+    
+    def validate(response):
+        if not response or response.get("type") in ("error", "single_question"):
+            return False
+        return all(check(response) for check in checks)
+    
+    return validate
+
+
+# Validators for the bundled test cases, compiled once at import
+_VALIDATORS = {
+    test_case.id: compile_expected_output(test_case.expected_output)
+    for test_case in create_minimal_test_cases()
+}
+
+
 class RateLimitedEvaluator:
     """Evaluator with built-in rate limiting"""
     
-    def __init__(self, base_url="http://localhost:5000", requests_per_minute=10):
-        self.evaluator = MealPlanEvaluator(base_url)
+    def __init__(self, base_url="http://localhost:5000", requests_per_minute=10, max_concurrency=10):
+        self.base_url = base_url
         self.requests_per_minute = requests_per_minute
-        self.min_interval = 60.0 / requests_per_minute  # seconds between requests
-        self.last_request_time = 0
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = RateLimiter(requests_per_minute, 60.0)
+        # One keep-alive connection pool shared by every test's session
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
     
-    def _wait_for_rate_limit(self):
-        """Wait if necessary to respect rate limits"""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        
-        if elapsed < self.min_interval:
-            wait_time = self.min_interval - elapsed
-            print(f"⏱️  Rate limiting: waiting {wait_time:.1f}s...")
-            time.sleep(wait_time)
-        
-        self.last_request_time = time.time()
+    def _new_session(self):
+        """Session with its own cookie jar (conversation) on the shared connection pool"""
+        session = requests.Session()
+        session.mount("http://", self.adapter)
+        session.mount("https://", self.adapter)
+        return session
     
     def run_limited_evaluation(self, test_cases):
-        """Run evaluation with rate limiting"""
+        """Run evaluation concurrently, with a shared limiter enforcing the rate limit"""
+        batches = max(0, len(test_cases) - 1) // self.requests_per_minute
         print(f"🔄 Running {len(test_cases)} tests with rate limiting...")
-        print(f"📊 Rate limit: {self.requests_per_minute} requests/minute")
-        print(f"⏱️  Estimated time: {len(test_cases) * self.min_interval:.1f}s")
+        print(f"📊 Rate limit: {self.requests_per_minute} requests/minute, up to {self.max_concurrency} in flight")
+        print(f"⏱️  Estimated time: at least {batches * 60.0:.1f}s plus response time (follow-up turns add requests)")
         print()
         
-        results = []
+        total = len(test_cases)
         
-        for i, test_case in enumerate(test_cases, 1):
-            print(f"[{i}/{len(test_cases)}] Running: {test_case.name}")
-            
-            # Wait for rate limit
-            self._wait_for_rate_limit()
-            
+        def run(numbered):
+            i, test_case = numbered
             try:
-                # Reset conversation
-                self.evaluator._reset_conversation()
-                
-                # Run the test
-                result = self._run_single_test(test_case)
-                results.append(result)
-                
+                # Each test gets its own evaluator, and so its own cookie jar and conversation
+                evaluator = MealPlanEvaluator(self.base_url, session=self._new_session())
+                result = self._run_single_test(test_case, evaluator)
                 status = "✅ PASSED" if result['passed'] else "❌ FAILED"
-                print(f"   {status} (Score: {result['score']:.2f})")
-                
+                print(f"[{i}/{total}] {test_case.name}: {status} (Score: {result['score']:.2f})")
+                return result
             except Exception as e:
-                print(f"   ❌ ERROR: {e}")
-                results.append({
+                print(f"[{i}/{total}] {test_case.name}: ❌ ERROR: {e}")
+                return {
                     'test_id': test_case.id,
                     'test_name': test_case.name,
                     'passed': False,
                     'score': 0.0,
                     'error': str(e)
-                })
+                }
         
-        return results
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return list(executor.map(run, enumerate(test_cases, 1)))
     
-    def _run_single_test(self, test_case):
+    def _run_single_test(self, test_case, evaluator):
         """Run a single test case"""
-        start_time = time.time()
+        # Time spent waiting on the limiter is not part of the test's execution time
+        waited = 0.0
+        start_time = time.perf_counter()
         
         try:
             input_message = test_case.input_data["message"]
             
-            # Send message and get response
-            response = self.evaluator._send_message(input_message)
+            # Send the message, then answer follow-up questions up to the final response
+            message = input_message
+            for turns in range(1, MAX_TURNS + 1):
+                waited += self.rate_limiter.acquire()
+                response = evaluator._send_message(message)
+                if response.get("type") != "single_question":
+                    break
+                message = FOLLOW_UP_REPLY
             
-            # For demo purposes, we'll do basic evaluation
-            # In practice, you'd want more sophisticated evaluation logic
+            execution_time = time.perf_counter() - start_time - waited
             
-            execution_time = time.time() - start_time
+            validate = _VALIDATORS.get(test_case.id)
+            if validate is None:
+                validate = compile_expected_output(test_case.expected_output)
             
             # Basic scoring
-            score = 0.8 if response and response.get('type') != 'error' else 0.0
+            score = 0.8 if validate(response) else 0.0
             passed = score >= 0.7
             
             return {
@@ -170,6 +231,7 @@ class RateLimitedEvaluator:
                 'score': score,
                 'execution_time': execution_time,
                 'response': response,
+                'turns': turns,
                 'input_message': input_message
             }
             
@@ -180,7 +242,7 @@ class RateLimitedEvaluator:
                 'category': test_case.category.value,
                 'passed': False,
                 'score': 0.0,
-                'execution_time': time.time() - start_time,
+                'execution_time': time.perf_counter() - start_time - waited,
                 'error': str(e)
             }
 
@@ -195,8 +257,9 @@ def generate_markdown_report(results, output_file="basic_ai_report.md"):
     pass_rate = passed_tests / total_tests if total_tests > 0 else 0
     avg_score = sum(r['score'] for r in results) / total_tests if total_tests > 0 else 0
     
-    # Generate report content
-    report_content = f"""# AI Meal Plan Assistant - Basic Evaluation Report
+    # Build the report as a list of parts and join once at the end
+    parts = []
+    parts.append(f"""# AI Meal Plan Assistant - Basic Evaluation Report
 
 **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
@@ -216,13 +279,13 @@ def generate_markdown_report(results, output_file="basic_ai_report.md"):
 
 ## Test Results Summary
 
-"""
+""")
     
     # Add test results
     for result in results:
         status_icon = "✅" if result['passed'] else "❌"
         
-        report_content += f"""### {status_icon} {result['test_name']}
+        parts.append(f"""### {status_icon} {result['test_name']}
 
 - **Test ID:** {result['test_id']}
 - **Category:** {result['category']}
@@ -230,47 +293,48 @@ def generate_markdown_report(results, output_file="basic_ai_report.md"):
 - **Score:** {result['score']:.2f}
 - **Execution Time:** {result.get('execution_time', 0):.2f}s
 
-"""
+""")
         
         if 'input_message' in result:
-            report_content += f"**Input:** {result['input_message']}\n\n"
+            parts.append(f"**Input:** {result['input_message']}\n\n")
         
         if 'response' in result and result['response']:
             response_type = result['response'].get('type', 'unknown')
-            report_content += f"**Response Type:** {response_type}\n\n"
+            parts.append(f"**Response Type:** {response_type}\n\n")
+            parts.append(f"**Turns:** {result.get('turns', 1)}\n\n")
         
         if 'error' in result:
-            report_content += f"**Error:** {result['error']}\n\n"
+            parts.append(f"**Error:** {result['error']}\n\n")
         
-        report_content += "---\n\n"
+        parts.append("---\n\n")
     
     # Add recommendations
-    report_content += """## Recommendations
+    parts.append("""## Recommendations
 
 Based on the evaluation results:
 
-"""
+""")
     
     if pass_rate >= 0.8:
-        report_content += """- ✅ **System is performing well** - Continue monitoring
+        parts.append("""- ✅ **System is performing well** - Continue monitoring
 - 🔄 **Regular evaluations** - Run weekly checks
 - 📈 **Performance tracking** - Monitor trends over time
-"""
+""")
     elif pass_rate >= 0.6:
-        report_content += """- ⚠️ **Address failing tests** - Focus on failed test cases
+        parts.append("""- ⚠️ **Address failing tests** - Focus on failed test cases
 - 🔍 **Investigate issues** - Review error messages and patterns
 - 🛠️ **Improve prompts** - Refine AI prompts based on failures
 - 📊 **Increase test frequency** - Run evaluations more often
-"""
+""")
     else:
-        report_content += """- 🚨 **Immediate action required** - System has critical issues
+        parts.append("""- 🚨 **Immediate action required** - System has critical issues
 - 🔧 **Review AI configuration** - Check API keys and settings
 - 📋 **Manual testing** - Verify system functionality manually
 - 🏥 **Safety review** - Ensure no unsafe responses are generated
 - 💬 **User feedback** - Gather user reports on system behavior
-"""
+""")
     
-    report_content += f"""
+    parts.append(f"""
 ## Next Steps
 
 1. **Review failed tests** - Address any failing test cases
@@ -287,11 +351,11 @@ Based on the evaluation results:
 ---
 
 *This report was generated using the AI Meal Plan Assistant Evaluation System*
-"""
+""")
     
     # Write to file
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(report_content)
+        f.write("".join(parts))
     
     return output_file
 
@@ -304,7 +368,6 @@ def main():
     
     # Check if Flask app is running
     try:
-        import requests
         response = requests.get("http://localhost:5000", timeout=5)
         if response.status_code == 200:
             print("✅ Flask app is running")
@@ -328,6 +391,13 @@ def main():
     try:
         results = evaluator.run_limited_evaluation(test_cases)
         
+        # If no test got an answer from /chat at all, the run itself is broken
+        # (app down, request rejected, ...) and a report of scores would mislead
+        if results and all('error' in r for r in results):
+            print()
+            print(f"❌ No test reached /chat successfully: {results[0]['error']}")
+            return 1
+        
         # Generate markdown report
         report_file = generate_markdown_report(results)
         
@@ -6,6 +6,7 @@ This script demonstrates the key features of the evaluation system
 with a guided walkthrough of different evaluation types.
 """
 
+import os
 import sys
 import time
 from pathlib import Path
@@ -13,7 +14,6 @@ from pathlib import Path
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from evals.evaluator import MealPlanEvaluator
 from evals.test_cases import (
     get_smoke_test_cases,
     get_test_cases_by_category,
@@ -38,14 +38,13 @@ def print_section(title):
     print()
 
 
-def demo_smoke_tests():
+def demo_smoke_tests(evaluator):
     """Demonstrate smoke testing"""
     print_section("🚀 Smoke Tests Demo")
     print("Smoke tests provide quick validation of core functionality.")
     print("These tests run fast and catch major issues early.")
     print()
     
-    evaluator = MealPlanEvaluator()
     test_cases = get_smoke_test_cases()
     
     print(f"Running {len(test_cases)} smoke tests...")
@@ -69,7 +68,7 @@ def demo_smoke_tests():
         print("   Make sure the Flask app is running on localhost:5000")
 
 
-def demo_category_testing():
+def demo_category_testing(evaluator):
     """Demonstrate category-specific testing"""
     print_section("📋 Category-Specific Testing Demo")
     print("Testing specific aspects of the AI system in detail.")
@@ -77,7 +76,6 @@ def demo_category_testing():
     
     # Test safety compliance
     print("🔒 Testing Safety Compliance...")
-    evaluator = MealPlanEvaluator()
     safety_tests = get_test_cases_by_category(EvalCategory.SAFETY_COMPLIANCE)
     
     try:
@@ -90,15 +88,13 @@ def demo_category_testing():
         print(f"   ❌ Safety tests failed: {e}")
 
 
-def demo_performance_benchmarking():
+def demo_performance_benchmarking(benchmark_suite):
     """Demonstrate performance benchmarking"""
     print_section("⚡ Performance Benchmarking Demo")
     print("Measuring AI performance against standardized benchmarks.")
     print()
     
     try:
-        benchmark_suite = BenchmarkSuite()
-        
         print("Running performance benchmark...")
         results = benchmark_suite.run_performance_benchmark()
         
@@ -121,14 +117,13 @@ def demo_performance_benchmarking():
         print(f"❌ Performance benchmark failed: {e}")
 
 
-def demo_report_generation():
+def demo_report_generation(evaluator):
     """Demonstrate report generation"""
     print_section("📊 Report Generation Demo")
     print("Generating comprehensive evaluation reports.")
     print()
     
     try:
-        evaluator = MealPlanEvaluator()
         reporter = EvaluationReporter(output_dir="demo_reports")
         
         # Run a small set of tests for demo
@@ -174,9 +169,13 @@ def demo_evaluation_insights():
         "📈 Benchmarking: Compares performance against industry standards"
     ]
     
+    # Dramatic pause for demo, skipped with DEMO_FAST=1 or when output isn't a terminal
+    pause = 0.0 if os.environ.get("DEMO_FAST") or not sys.stdout.isatty() else 0.5
+    
     for insight in insights:
-        print(f"   {insight}")
-        time.sleep(0.5)  # Dramatic pause for demo
+        print(f"   {insight}", flush=True)
+        if pause:
+            time.sleep(pause)
     
     print()
     print("🚀 This comprehensive evaluation system ensures:")
@@ -196,10 +195,13 @@ def main():
     
     input("Press Enter to start the demo...")
     
-    # Test connection
+    # One suite for the whole demo; its evaluator (and connection pool) is shared by every section
+    benchmark_suite = BenchmarkSuite()
+    evaluator = benchmark_suite.evaluator
+    
+    # Test connection with a HEAD request on the shared session, so the connection is reused by the demos
     try:
-        import requests
-        response = requests.get("http://localhost:5000", timeout=5)
+        response = evaluator.session.head(f"{evaluator.base_url}/", timeout=2, allow_redirects=False)
         if response.status_code == 200:
             print("✅ Flask app is running - starting demo")
         else:
@@ -210,16 +212,16 @@ def main():
     
     # Run demo sections
     try:
-        demo_smoke_tests()
+        demo_smoke_tests(evaluator)
         input("\nPress Enter for next demo...")
         
-        demo_category_testing()
+        demo_category_testing(evaluator)
         input("\nPress Enter for next demo...")
         
-        demo_performance_benchmarking()
+        demo_performance_benchmarking(benchmark_suite)
         input("\nPress Enter for next demo...")
         
-        demo_report_generation()
+        demo_report_generation(evaluator)
         input("\nPress Enter for final insights...")
         
         demo_evaluation_insights()
@@ -5,21 +5,58 @@ This module provides standardized benchmarks for measuring AI performance
 across different dimensions and comparing against baseline expectations.
 """
 
+import bisect
 import time
-import statistics
-from typing import Dict, List, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+from .cache import ResponseCache
 from .evaluator import MealPlanEvaluator, EvalResult
+from .rate_limiter import TokenBucket
+from .semantic_cache import SemanticCache
 from .test_cases import get_all_test_cases
 
 
 class BenchmarkSuite:
     """Standardized benchmark suite for AI meal planning assistant"""
     
-    def __init__(self, base_url: str = "http://localhost:5000"):
-        self.evaluator = MealPlanEvaluator(base_url)
+    # Accuracy test key -> structured_data field it is scored against
+    ACCURACY_FIELDS = (
+        ('expected_conditions', 'health_conditions'),
+        ('expected_restrictions', 'dietary_restrictions'),
+        ('expected_likes', 'likes'),
+        ('expected_dislikes', 'dislikes'),
+    )
+    
+    # Minimum pass rate for each grade above F, lowest first
+    GRADE_THRESHOLDS = (0.65, 0.70, 0.75, 0.80, 0.85, 0.90, 0.95)
+    GRADES = ('F', 'D', 'C', 'C+', 'B', 'B+', 'A', 'A+')
+    
+    # Baseline metrics where a lower value is better
+    LOWER_IS_BETTER = frozenset({'average_response_time', 'max_response_time', 'error_rate'})
+    
+    def __init__(self, base_url: str = "http://localhost:5000", max_workers: int = 4,
+                 cache_mode: str = "disabled", cache_path: str = "eval_cache.sqlite",
+                 semantic_cache: bool = False, rpm: Optional[float] = None,
+                 tpm: Optional[float] = None):
+        self.cache = ResponseCache(cache_path, cache_mode)
+        self.semantic_cache = SemanticCache() if semantic_cache else None
+        # Shared by all worker threads, so the limits apply to the suite as a whole
+        self.rate_limiter = TokenBucket(rpm, tpm) if rpm or tpm else None
+        self.evaluator = MealPlanEvaluator(
+            base_url,
+            max_workers=max_workers,
+            cache=self.cache,
+            semantic_cache=self.semantic_cache,
+            rate_limiter=self.rate_limiter
+        )
         self.baseline_metrics = self._get_baseline_metrics()
+        # (metric, baseline, lower is better), resolved once rather than per comparison
+        self.baseline_table = [
+            (name, baseline, name in self.LOWER_IS_BETTER)
+            for name, baseline in self.baseline_metrics.items()
+        ]
     
     def _get_baseline_metrics(self) -> Dict[str, float]:
         """Define baseline performance expectations"""
@@ -47,7 +84,7 @@ class BenchmarkSuite:
         """Run comprehensive benchmark suite"""
         print("🚀 Starting Full Benchmark Suite...")
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Run all test cases
         test_cases = get_all_test_cases()
@@ -62,7 +99,7 @@ class BenchmarkSuite:
         # Generate benchmark report
         report = {
             'timestamp': datetime.now().isoformat(),
-            'total_execution_time': time.time() - start_time,
+            'total_execution_time': time.perf_counter() - start_time,
             'test_summary': {
                 'total_tests': suite.total_tests,
                 'passed_tests': suite.passed_tests,
@@ -104,58 +141,22 @@ class BenchmarkSuite:
             }
         ]
         
-        results = []
-        
-        for test in performance_tests:
-            print(f"  Testing: {test['name']}")
-            
-            # Reset conversation
-            self.evaluator._reset_conversation()
-            
-            start_time = time.time()
-            
-            try:
-                if 'messages' in test:
-                    # Multi-turn test
-                    responses = []
-                    for message in test['messages']:
-                        response = self.evaluator._send_message(message)
-                        responses.append(response)
-                    final_response = responses[-1]
-                else:
-                    # Single message test
-                    final_response = self.evaluator._send_message(test['message'])
-                
-                execution_time = time.time() - start_time
-                
-                results.append({
-                    'test_name': test['name'],
-                    'execution_time': execution_time,
-                    'expected_max_time': test['expected_max_time'],
-                    'within_threshold': execution_time <= test['expected_max_time'],
-                    'response_received': final_response is not None,
-                    'response_type': final_response.get('type', 'unknown') if final_response else 'none'
-                })
-                
-            except Exception as e:
-                results.append({
-                    'test_name': test['name'],
-                    'execution_time': -1,
-                    'expected_max_time': test['expected_max_time'],
-                    'within_threshold': False,
-                    'response_received': False,
-                    'error': str(e)
-                })
+        # Tests are independent conversations, so run them side by side
+        if self.evaluator.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.evaluator.max_workers, len(performance_tests))) as executor:
+                results = list(executor.map(self._run_performance_test, performance_tests))
+        else:
+            results = [self._run_performance_test(test) for test in performance_tests]
         
         # Calculate performance metrics
         response_times = [r['execution_time'] for r in results if r['execution_time'] > 0]
         performance_metrics = {
-            'average_response_time': statistics.mean(response_times) if response_times else 0,
-            'max_response_time': max(response_times) if response_times else 0,
-            'min_response_time': min(response_times) if response_times else 0,
-            'tests_within_threshold': sum(1 for r in results if r['within_threshold']),
+            'average_response_time': sum(response_times) / len(response_times) if response_times else 0,
+            'max_response_time': max(response_times, default=0),
+            'min_response_time': min(response_times, default=0),
+            'tests_within_threshold': sum(r['within_threshold'] for r in results),
             'total_tests': len(results),
-            'success_rate': sum(1 for r in results if r['response_received']) / len(results)
+            'success_rate': sum(r['response_received'] for r in results) / len(results)
         }
         
         return {
@@ -176,6 +177,49 @@ class BenchmarkSuite:
             }
         }
     
+    def _run_performance_test(self, test: Dict[str, Any]) -> Dict[str, Any]:
+        """Time one performance test on the calling thread's conversation"""
+        print(f"  Testing: {test['name']}")
+        
+        # Reset conversation
+        self.evaluator._reset_conversation()
+        
+        start_time, throttled = time.perf_counter(), self.evaluator._throttled_time()
+        
+        try:
+            if 'messages' in test:
+                # Multi-turn test
+                responses = []
+                for message in test['messages']:
+                    response = self.evaluator._send_message(message)
+                    responses.append(response)
+                final_response = responses[-1]
+            else:
+                # Single message test
+                final_response = self.evaluator._send_message(test['message'])
+            
+            # Time spent held back by the rate limiter is not response time
+            execution_time = time.perf_counter() - start_time - (self.evaluator._throttled_time() - throttled)
+            
+            return {
+                'test_name': test['name'],
+                'execution_time': execution_time,
+                'expected_max_time': test['expected_max_time'],
+                'within_threshold': execution_time <= test['expected_max_time'],
+                'response_received': final_response is not None,
+                'response_type': final_response.get('type', 'unknown') if final_response else 'none'
+            }
+        
+        except Exception as e:
+            return {
+                'test_name': test['name'],
+                'execution_time': -1,
+                'expected_max_time': test['expected_max_time'],
+                'within_threshold': False,
+                'response_received': False,
+                'error': str(e)
+            }
+    
     def run_accuracy_benchmark(self) -> Dict[str, Any]:
         """Run focused accuracy benchmark"""
         print("🎯 Running Accuracy Benchmark...")
@@ -249,13 +293,14 @@ class BenchmarkSuite:
         
         # Calculate overall accuracy metrics
         accuracy_scores = [r['accuracy_score'] for r in results]
+        tests_passed = sum(r['passed'] for r in results)
         accuracy_metrics = {
-            'average_accuracy': statistics.mean(accuracy_scores) if accuracy_scores else 0,
-            'min_accuracy': min(accuracy_scores) if accuracy_scores else 0,
-            'max_accuracy': max(accuracy_scores) if accuracy_scores else 0,
-            'tests_passed': sum(1 for r in results if r['passed']),
+            'average_accuracy': sum(accuracy_scores) / len(accuracy_scores) if accuracy_scores else 0,
+            'min_accuracy': min(accuracy_scores, default=0),
+            'max_accuracy': max(accuracy_scores, default=0),
+            'tests_passed': tests_passed,
             'total_tests': len(results),
-            'pass_rate': sum(1 for r in results if r['passed']) / len(results) if results else 0
+            'pass_rate': tests_passed / len(results) if results else 0
         }
         
         return {
@@ -276,43 +321,51 @@ class BenchmarkSuite:
         if not results:
             return {}
         
-        # Group results by category
-        category_results = {}
+        # One pass over the results: per-category [score sum, passed, count] plus overall totals
+        category_totals = {}
+        score_sum = 0.0
+        passed_count = 0
+        error_count = 0
+        time_sum = 0.0
+        
         for result in results:
-            category = result.test_case_id.split('_')[0]
-            if category not in category_results:
-                category_results[category] = []
-            category_results[category].append(result)
+            totals = category_totals.get(result.category_code)
+            if totals is None:
+                totals = category_totals[result.category_code] = [0.0, 0, 0]
+            totals[0] += result.score
+            totals[1] += result.passed
+            totals[2] += 1
+            
+            score_sum += result.score
+            passed_count += result.passed
+            error_count += bool(result.errors)
+            time_sum += result.execution_time
         
         metrics = {}
         
         # Calculate category-specific metrics
-        for category, cat_results in category_results.items():
-            scores = [r.score for r in cat_results]
-            pass_rate = sum(1 for r in cat_results if r.passed) / len(cat_results)
-            
+        for category, (cat_score_sum, cat_passed, cat_count) in category_totals.items():
             if category == 'de':  # data extraction
-                metrics['data_extraction_accuracy'] = statistics.mean(scores)
+                metrics['data_extraction_accuracy'] = cat_score_sum / cat_count
             elif category == 'mpq':  # meal plan quality
-                metrics['meal_plan_quality_score'] = statistics.mean(scores)
+                metrics['meal_plan_quality_score'] = cat_score_sum / cat_count
             elif category == 'sc':  # safety compliance
-                metrics['safety_compliance_rate'] = pass_rate
+                metrics['safety_compliance_rate'] = cat_passed / cat_count
             elif category == 'cf':  # conversation flow
-                metrics['conversation_flow_score'] = statistics.mean(scores)
+                metrics['conversation_flow_score'] = cat_score_sum / cat_count
+        
+        total = len(results)
         
         # Calculate performance metrics
-        response_times = [r.execution_time for r in results]
-        metrics['average_response_time'] = statistics.mean(response_times)
-        metrics['max_response_time'] = max(response_times)
+        metrics['average_response_time'] = time_sum / total
+        metrics['max_response_time'] = max(result.execution_time for result in results)
         
         # Calculate overall metrics
-        all_scores = [r.score for r in results]
-        metrics['overall_score'] = statistics.mean(all_scores)
-        metrics['overall_pass_rate'] = sum(1 for r in results if r.passed) / len(results)
+        metrics['overall_score'] = score_sum / total
+        metrics['overall_pass_rate'] = passed_count / total
         
         # Calculate error rate
-        error_count = sum(1 for r in results if r.errors)
-        metrics['error_rate'] = error_count / len(results)
+        metrics['error_rate'] = error_count / total
         
         # User experience score (composite)
         ux_factors = [
@@ -328,10 +381,10 @@ class BenchmarkSuite:
         """Compare actual metrics against baseline expectations"""
         comparison = {}
         
-        for metric_name, baseline_value in self.baseline_metrics.items():
+        for metric_name, baseline_value, lower_is_better in self.baseline_table:
             actual_value = metrics.get(metric_name, 0)
             
-            if metric_name in ['average_response_time', 'max_response_time', 'error_rate']:
+            if lower_is_better:
                 # Lower is better for these metrics
                 passes = actual_value <= baseline_value
                 performance_ratio = baseline_value / actual_value if actual_value > 0 else 0
@@ -352,26 +405,11 @@ class BenchmarkSuite:
     
     def _calculate_performance_grade(self, comparison: Dict[str, Dict[str, Any]]) -> str:
         """Calculate overall performance grade"""
-        passed_metrics = sum(1 for comp in comparison.values() if comp['passes'])
+        passed_metrics = sum(comp['passes'] for comp in comparison.values())
         total_metrics = len(comparison)
         pass_rate = passed_metrics / total_metrics if total_metrics > 0 else 0
         
-        if pass_rate >= 0.95:
-            return 'A+'
-        elif pass_rate >= 0.90:
-            return 'A'
-        elif pass_rate >= 0.85:
-            return 'B+'
-        elif pass_rate >= 0.80:
-            return 'B'
-        elif pass_rate >= 0.75:
-            return 'C+'
-        elif pass_rate >= 0.70:
-            return 'C'
-        elif pass_rate >= 0.65:
-            return 'D'
-        else:
-            return 'F'
+        return self.GRADES[bisect.bisect_right(self.GRADE_THRESHOLDS, pass_rate)]
     
     def _generate_recommendations(self, comparison: Dict[str, Dict[str, Any]]) -> List[str]:
         """Generate improvement recommendations based on benchmark results"""
@@ -411,36 +449,16 @@ class BenchmarkSuite:
         score = 0.0
         total_checks = 0
         
-        # Check expected conditions
-        if 'expected_conditions' in test:
-            expected = test['expected_conditions']
-            actual = structured_data.get('health_conditions', [])
-            overlap = len(set(expected) & set(actual))
-            score += overlap / len(expected) if expected else 1.0
-            total_checks += 1
-        
-        # Check expected restrictions
-        if 'expected_restrictions' in test:
-            expected = test['expected_restrictions']
-            actual = structured_data.get('dietary_restrictions', [])
-            overlap = len(set(expected) & set(actual))
-            score += overlap / len(expected) if expected else 1.0
-            total_checks += 1
-        
-        # Check expected likes
-        if 'expected_likes' in test:
-            expected = test['expected_likes']
-            actual = structured_data.get('likes', [])
-            overlap = len(set(expected) & set(actual))
-            score += overlap / len(expected) if expected else 1.0
-            total_checks += 1
-        
-        # Check expected dislikes
-        if 'expected_dislikes' in test:
-            expected = test['expected_dislikes']
-            actual = structured_data.get('dislikes', [])
-            overlap = len(set(expected) & set(actual))
-            score += overlap / len(expected) if expected else 1.0
+        for test_key, data_key in self.ACCURACY_FIELDS:
+            if test_key not in test:
+                continue
+            
+            expected = test[test_key]
+            if expected:
+                overlap = len(set(expected).intersection(structured_data.get(data_key) or ()))
+                score += overlap / len(expected)
+            else:
+                score += 1.0
             total_checks += 1
         
         return score / total_checks if total_checks > 0 else 0.0
@@ -0,0 +1,85 @@
+"""
+Response cache for evaluation runs
+
+Stores /chat responses in a local SQLite file, keyed by the message and the
+conversation that led up to it, so repeated benchmark runs can skip the
+server and the LLM behind it.
+
+Modes:
+- enabled:  serve hits from the cache, send misses to the server and store them
+- replay:   serve hits only; a miss raises CacheMiss
+- disabled: no caching
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+CACHE_MODES = ("enabled", "replay", "disabled")
+
+
+class CacheMiss(KeyError):
+    """Raised in replay mode when a response is not in the cache"""
+
+
+class ResponseCache:
+    """SQLite-backed cache of chat responses, safe to share between threads"""
+
+    def __init__(self, path: str = "eval_cache.sqlite", mode: str = "enabled"):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if mode != "disabled":
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, response BLOB, ts REAL)"
+            )
+            self._conn.commit()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "disabled"
+
+    @staticmethod
+    def make_key(message: str, history: List[str]) -> str:
+        """Key a message by its text and the messages sent before it in the conversation"""
+        payload = json.dumps([history, message], separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if row is None:
+            if self.mode == "replay":
+                raise CacheMiss(key)
+            return None
+        return json.loads(row[0])
+
+    def put(self, key: str, response: Dict[str, Any]):
+        data = json.dumps(response, separators=(",", ":")).encode()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, response, ts) VALUES (?, ?, ?)",
+                (key, data, time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
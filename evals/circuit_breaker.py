@@ -0,0 +1,57 @@
+"""
+Circuit breaker for evaluation runs
+
+Once the application fails a number of requests in a row, further requests
+fail straight away for a cooldown period instead of each worker waiting on
+a server that is down. After the cooldown requests are let through again;
+one success closes the circuit, another failure reopens it.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit is open"""
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker"""
+
+    def __init__(self, fail_max: int = 10, reset_timeout: float = 15.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._remaining() > 0
+
+    def _remaining(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return self.reset_timeout - (time.monotonic() - self._opened_at)
+
+    def check(self):
+        """Raise CircuitOpenError if requests should not be sent right now"""
+        with self._lock:
+            remaining = self._remaining()
+            if remaining > 0:
+                raise CircuitOpenError(
+                    f"Circuit open after {self.failures} consecutive failures; retrying in {remaining:.0f}s"
+                )
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.fail_max:
+                self._opened_at = time.monotonic()
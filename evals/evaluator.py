@@ -11,14 +11,37 @@ the AI meal planning assistant across various dimensions including:
 """
 
 import json
+import sys
+import threading
 import time
 import uuid
-from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-import statistics
+
+from .cache import CacheMiss, ResponseCache
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .rate_limiter import TokenBucket
+from .semantic_cache import SemanticCache
+
+# Slotted dataclasses are smaller and faster to read; slots= needs Python 3.10+
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# Sent with every /chat body, so injected sessions without a default Content-Type still work
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@lru_cache(maxsize=256)
+def _chat_body(message: str) -> bytes:
+    """Encoded /chat request body; the canned follow-up replies are encoded once and reused"""
+    return json.dumps({"message": message}).encode()
 
 
 class EvalCategory(Enum):
@@ -32,21 +55,21 @@ class EvalCategory(Enum):
     PERFORMANCE = "performance"
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
 class TestCase:
     """Represents a single test case for evaluation"""
     id: str
     category: EvalCategory
     name: str
     description: str
-    input_data: Dict[str, Any]
-    expected_output: Dict[str, Any]
-    evaluation_criteria: List[str]
+    input_data: Mapping[str, Any]
+    expected_output: Mapping[str, Any]
+    evaluation_criteria: Sequence[str]
     priority: str = "medium"  # low, medium, high, critical
-    tags: List[str] = field(default_factory=list)
+    tags: Sequence[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class EvalResult:
     """Results from running a single evaluation"""
     test_case_id: str
@@ -57,9 +80,15 @@ class EvalResult:
     timestamp: datetime
     errors: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
+    # Test id prefix such as "de" or "sc" (not an EvalCategory); derived from test_case_id when not given
+    category_code: str = ""
+    
+    def __post_init__(self):
+        if not self.category_code:
+            self.category_code = self.test_case_id.partition('_')[0]
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class EvalSuite:
     """Collection of evaluation results"""
     suite_id: str
@@ -68,6 +97,18 @@ class EvalSuite:
     results: List[EvalResult] = field(default_factory=list)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    # Running totals kept by add_result, so the summary properties don't rescan results
+    _score_sum: float = field(default=0.0, init=False, repr=False)
+    _passed: int = field(default=0, init=False, repr=False)
+    
+    def __post_init__(self):
+        self._score_sum = sum(r.score for r in self.results)
+        self._passed = sum(1 for r in self.results if r.passed)
+    
+    def add_result(self, result: EvalResult):
+        self.results.append(result)
+        self._score_sum += result.score
+        self._passed += result.passed
     
     @property
     def total_tests(self) -> int:
@@ -75,7 +116,7 @@ class EvalSuite:
     
     @property
     def passed_tests(self) -> int:
-        return sum(1 for r in self.results if r.passed)
+        return self._passed
     
     @property
     def failed_tests(self) -> int:
@@ -91,7 +132,7 @@ class EvalSuite:
     def average_score(self) -> float:
         if not self.results:
             return 0.0
-        return statistics.mean(r.score for r in self.results)
+        return self._score_sum / len(self.results)
     
     @property
     def execution_time(self) -> float:
@@ -103,12 +144,72 @@ class EvalSuite:
 class MealPlanEvaluator:
     """Main evaluator class for the meal plan assistant"""
     
-    def __init__(self, base_url: str = "http://localhost:5000"):
+    def __init__(self, base_url: str = "http://localhost:5000", session: Optional[requests.Session] = None,
+                 max_workers: int = 1, cache: Optional[ResponseCache] = None,
+                 semantic_cache: Optional[SemanticCache] = None,
+                 rate_limiter: Optional[TokenBucket] = None, full_details: bool = False,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 timeout: Tuple[float, float] = (3.0, 60.0)):
+        if session is not None and max_workers > 1:
+            raise ValueError("An injected session holds a single conversation and can't be shared by workers")
         self.base_url = base_url
-        self.session = requests.Session()
-        
-    def run_evaluation_suite(self, test_cases: List[TestCase]) -> EvalSuite:
-        """Run a complete evaluation suite"""
+        self.max_workers = max_workers
+        self.cache = cache if cache is not None and cache.enabled else None
+        self.semantic_cache = semantic_cache
+        self.rate_limiter = rate_limiter
+        # Fail fast while the application is down, rather than every worker waiting on it
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        # (connect, read): a turn can make two sequential LLM calls, each allowed 30s by the app
+        self.timeout = timeout
+        # Keep every response in result details, or just the turn types and the final response
+        self.full_details = full_details
+        self._details_sink: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None
+        # One keep-alive connection pool for the evaluator. Each thread gets its own
+        # Session on top of it, so concurrent tests never share a conversation cookie.
+        # Retry covers failed connects, and 502/503/504 only for idempotent methods,
+        # so a chat turn is never sent twice.
+        retries = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+        self.pool_maxsize = max(max_workers, 10)
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=retries)
+        self._local = threading.local()
+        # An injected session is used on every thread, so the evaluator then runs one test at a time
+        self._session = session
+        self._evaluators = {
+            EvalCategory.DATA_EXTRACTION: self._evaluate_data_extraction,
+            EvalCategory.MEAL_PLAN_QUALITY: self._evaluate_meal_plan_quality,
+            EvalCategory.SAFETY_COMPLIANCE: self._evaluate_safety_compliance,
+            EvalCategory.USER_EXPERIENCE: self._evaluate_user_experience,
+            EvalCategory.CONVERSATION_FLOW: self._evaluate_conversation_flow,
+            EvalCategory.EDGE_CASES: self._evaluate_edge_cases,
+            EvalCategory.PERFORMANCE: self._evaluate_performance,
+        }
+    
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers["Connection"] = "keep-alive"
+        session.mount("http://", self.adapter)
+        session.mount("https://", self.adapter)
+        return session
+    
+    @property
+    def session(self) -> requests.Session:
+        """The injected session, or else the calling thread's own session"""
+        if self._session is not None:
+            return self._session
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+        
+    def run_evaluation_suite(self, test_cases: List[TestCase], max_workers: Optional[int] = None,
+                             details_path: Optional[str] = None,
+                             on_result: Optional[Callable[[EvalResult], None]] = None) -> EvalSuite:
+        """Run a complete evaluation suite, max_workers tests at a time (defaults to the evaluator's)
+
+        With details_path, every test's full list of responses is appended to that
+        file as one JSON line, whatever full_details is set to. on_result, if given,
+        is called with each result as the suite progresses (e.g. to show progress).
+        """
         suite_id = str(uuid.uuid4())
         suite = EvalSuite(
             suite_id=suite_id,
@@ -117,53 +218,63 @@ class MealPlanEvaluator:
             started_at=datetime.now()
         )
         
-        for test_case in test_cases:
-            try:
-                result = self._run_single_test(test_case)
-                suite.results.append(result)
-            except Exception as e:
-                # Create a failed result for the test case
-                error_result = EvalResult(
-                    test_case_id=test_case.id,
-                    passed=False,
-                    score=0.0,
-                    details={"error": str(e)},
-                    execution_time=0.0,
-                    timestamp=datetime.now(),
-                    errors=[str(e)]
-                )
-                suite.results.append(error_result)
+        details_file = open(details_path, "a", encoding="utf-8") if details_path else None
+        if details_file is not None:
+            write_lock = threading.Lock()
+            
+            def sink(test_case_id: str, responses: List[Dict[str, Any]]):
+                line = json.dumps({"test_case_id": test_case_id, "responses": responses}, default=str)
+                with write_lock:
+                    details_file.write(line + "\n")
+            
+            self._details_sink = sink
+        
+        try:
+            for result in self.iter_evaluation(test_cases, max_workers):
+                suite.add_result(result)
+                if on_result is not None:
+                    on_result(result)
+        finally:
+            if details_file is not None:
+                self._details_sink = None
+                details_file.close()
         
         suite.completed_at = datetime.now()
         return suite
     
+    def iter_evaluation(self, test_cases: List[TestCase], max_workers: Optional[int] = None) -> Iterator[EvalResult]:
+        """Run test cases max_workers at a time, yielding each result in test order as it is ready
+
+        max_workers is capped at the connection pool size, so no worker waits on
+        (or throws away) a connection beyond the pool.
+        """
+        max_workers = min(max_workers or self.max_workers, self.pool_maxsize)
+        if max_workers > 1 and self._session is not None:
+            raise ValueError("An injected session holds a single conversation and can't be shared by workers")
+        if max_workers > 1:
+            # Every test resets its own conversation on its thread's session,
+            # so multi-turn tests are as independent as single-turn ones
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                yield from executor.map(self._run_single_test, test_cases)
+        else:
+            yield from map(self._run_single_test, test_cases)
+    
     def _run_single_test(self, test_case: TestCase) -> EvalResult:
-        """Run a single test case"""
-        start_time = time.time()
+        """Run a single test case; any exception comes back as a failed result rather than raising"""
+        start_time, throttled = time.perf_counter(), self._throttled_time()
         
         try:
             # Reset conversation before each test
             self._reset_conversation()
             
             # Execute the test based on category
-            if test_case.category == EvalCategory.DATA_EXTRACTION:
-                result = self._evaluate_data_extraction(test_case)
-            elif test_case.category == EvalCategory.MEAL_PLAN_QUALITY:
-                result = self._evaluate_meal_plan_quality(test_case)
-            elif test_case.category == EvalCategory.SAFETY_COMPLIANCE:
-                result = self._evaluate_safety_compliance(test_case)
-            elif test_case.category == EvalCategory.USER_EXPERIENCE:
-                result = self._evaluate_user_experience(test_case)
-            elif test_case.category == EvalCategory.CONVERSATION_FLOW:
-                result = self._evaluate_conversation_flow(test_case)
-            elif test_case.category == EvalCategory.EDGE_CASES:
-                result = self._evaluate_edge_cases(test_case)
-            elif test_case.category == EvalCategory.PERFORMANCE:
-                result = self._evaluate_performance(test_case)
-            else:
+            evaluate = self._evaluators.get(test_case.category)
+            if evaluate is None:
                 raise ValueError(f"Unknown evaluation category: {test_case.category}")
+            result = evaluate(test_case)
             
-            execution_time = time.time() - start_time
+            # Time spent held back by the rate limiter is not execution time
+            execution_time = time.perf_counter() - start_time - (self._throttled_time() - throttled)
             
             return EvalResult(
                 test_case_id=test_case.id,
@@ -177,32 +288,112 @@ class MealPlanEvaluator:
             )
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time - (self._throttled_time() - throttled)
             return EvalResult(
                 test_case_id=test_case.id,
                 passed=False,
                 score=0.0,
-                details={"error": str(e)},
+                # The type separates infrastructure failures (ConnectionError, Timeout,
+                # CircuitOpenError) from failures of the evaluation itself
+                details={"error": str(e), "error_type": type(e).__name__},
                 execution_time=execution_time,
                 timestamp=datetime.now(),
                 errors=[str(e)]
             )
     
+    def _conversation(self) -> Tuple[List[str], List[str]]:
+        """Messages in the calling thread's conversation, and those so far only served from cache"""
+        if not hasattr(self._local, "history"):
+            self._local.history, self._local.unsent = [], []
+        return self._local.history, self._local.unsent
+    
     def _reset_conversation(self):
         """Reset the conversation state"""
-        try:
-            response = self.session.post(f"{self.base_url}/reset")
-            response.raise_for_status()
-        except Exception as e:
-            print(f"Warning: Could not reset conversation: {e}")
+        self._local.history, self._local.unsent = [], []
+        # The server finds the conversation through the session cookie, so dropping
+        # the cookie starts a new one without a round-trip to /reset
+        self.session.cookies.clear()
     
     def _send_message(self, message: str) -> Dict[str, Any]:
+        """Send a message to the chat endpoint, or answer it from the response caches"""
+        if self.cache is None and self.semantic_cache is None:
+            return self._post_message(message)
+        
+        history, unsent = self._conversation()
+        response = None
+        if self.cache is not None:
+            key = ResponseCache.make_key(message, history)
+            try:
+                response = self.cache.get(key)
+            except CacheMiss:
+                # A replay miss may still have a near-duplicate in the semantic cache
+                response = self.semantic_cache.get(message, history) if self.semantic_cache is not None else None
+                if response is None:
+                    raise
+            else:
+                if response is not None and self.semantic_cache is not None:
+                    # Replay runs never post, so exact hits are what fill the semantic cache;
+                    # put keeps an existing entry, so repeated hits don't pile up duplicates
+                    self.semantic_cache.put(message, history, response)
+        if response is None and self.semantic_cache is not None:
+            response = self.semantic_cache.get(message, history)
+        
+        if response is None:
+            # Earlier turns may have come from the cache; bring the server's conversation up to date first
+            for earlier in unsent:
+                self._post_message(earlier)
+            unsent.clear()
+            
+            response = self._post_message(message)
+            if response.get('type') != 'error':
+                if self.cache is not None:
+                    self.cache.put(key, response)
+                if self.semantic_cache is not None:
+                    self.semantic_cache.put(message, history, response)
+        else:
+            unsent.append(message)
+        
+        history.append(message)
+        return response
+    
+    def _throttled_time(self) -> float:
+        """Seconds the calling thread has spent waiting on the rate limiter"""
+        return getattr(self._local, "throttled", 0.0)
+    
+    def _response_details(self, test_case: TestCase, responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Details entries describing a test's responses, bounded unless full_details is set"""
+        if self._details_sink is not None:
+            self._details_sink(test_case.id, responses)
+        if self.full_details:
+            return {"responses": responses}
+        return {
+            "response_types": [r.get("type") for r in responses],
+            "final_response": responses[-1] if responses else {}
+        }
+    
+    def _post_message(self, message: str) -> Dict[str, Any]:
         """Send a message to the chat endpoint"""
-        response = self.session.post(
-            f"{self.base_url}/chat",
-            json={"message": message},
-            headers={"Content-Type": "application/json"}
-        )
+        if self.rate_limiter is not None:
+            # Rough token estimate: about four characters per token
+            waited = self.rate_limiter.acquire(len(message) // 4)
+            self._local.throttled = self._throttled_time() + waited
+        
+        self.circuit_breaker.check()
+        try:
+            response = self.session.post(
+                f"{self.base_url}/chat",
+                data=_chat_body(message),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout
+            )
+        except (requests.ConnectionError, requests.Timeout):
+            self.circuit_breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            # A 4xx is the app answering (edge-case tests provoke them on purpose), not an outage
+            self.circuit_breaker.record_success()
         response.raise_for_status()
         return response.json()
     
@@ -238,13 +429,13 @@ class MealPlanEvaluator:
             "passed": score >= 0.7,
             "score": score,
             "details": {
-                "expected": expected_data,
+                "expected": dict(expected_data),
                 "actual": actual_data,
-                "responses": responses
+                **self._response_details(test_case, responses)
             }
         }
     
-    def _calculate_data_extraction_score(self, expected: Dict, actual: Dict) -> float:
+    def _calculate_data_extraction_score(self, expected: Mapping, actual: Dict) -> float:
         """Calculate accuracy score for data extraction"""
         if not expected or not actual:
             return 0.0
@@ -255,22 +446,21 @@ class MealPlanEvaluator:
         for key, expected_value in expected.items():
             actual_value = actual.get(key)
             
-            if isinstance(expected_value, list) and isinstance(actual_value, list):
+            if isinstance(expected_value, (list, tuple)) and isinstance(actual_value, list):
                 # For lists, calculate overlap
                 if not expected_value and not actual_value:
                     correct_fields += 1
                 elif expected_value and actual_value:
-                    overlap = len(set(expected_value) & set(actual_value))
-                    total_expected = len(expected_value)
-                    field_score = overlap / total_expected if total_expected > 0 else 0
-                    correct_fields += field_score
+                    overlap = len(set(expected_value).intersection(actual_value))
+                    correct_fields += overlap / len(expected_value)
             elif expected_value == actual_value:
                 correct_fields += 1
             elif expected_value is None and actual_value is None:
                 correct_fields += 1
             elif isinstance(expected_value, str) and isinstance(actual_value, str):
-                # For strings, check if they're similar
-                if expected_value.lower() in actual_value.lower() or actual_value.lower() in expected_value.lower():
+                # For strings, check if they're similar (casefold is the Unicode-aware lower)
+                expected_lower, actual_lower = expected_value.casefold(), actual_value.casefold()
+                if expected_lower in actual_lower or actual_lower in expected_lower:
                     correct_fields += 0.5
         
         return correct_fields / total_fields if total_fields > 0 else 0.0
@@ -307,11 +497,11 @@ class MealPlanEvaluator:
             "details": {
                 "meal_plan": meal_plan,
                 "quality_criteria": quality_criteria,
-                "responses": responses
+                **self._response_details(test_case, responses)
             }
         }
     
-    def _calculate_meal_plan_quality_score(self, meal_plan: Dict, criteria: List[str]) -> float:
+    def _calculate_meal_plan_quality_score(self, meal_plan: Dict, criteria: Sequence[str]) -> float:
         """Calculate quality score for meal plan"""
         if not meal_plan:
             return 0.0
@@ -377,7 +567,7 @@ class MealPlanEvaluator:
                 "should_reject": should_reject,
                 "was_rejected": was_rejected,
                 "rejected_info": rejected_info,
-                "responses": responses
+                **self._response_details(test_case, responses)
             }
         }
     
@@ -390,9 +580,10 @@ class MealPlanEvaluator:
         response_times = []
         
         for i in range(3):  # Test conversation flow
-            start_time = time.time()
+            start_time, throttled = time.perf_counter(), self._throttled_time()
             response = self._send_message(current_message)
-            response_time = time.time() - start_time
+            # Time spent held back by the rate limiter is not response time
+            response_time = time.perf_counter() - start_time - (self._throttled_time() - throttled)
             response_times.append(response_time)
             responses.append(response)
             
@@ -405,14 +596,15 @@ class MealPlanEvaluator:
         
         # Calculate UX score
         ux_score = self._calculate_ux_score(responses, response_times)
+        average_response_time = sum(response_times) / len(response_times) if response_times else 0.0
         
         return {
             "passed": ux_score >= 0.7,
             "score": ux_score,
             "details": {
-                "responses": responses,
+                **self._response_details(test_case, responses),
                 "response_times": response_times,
-                "average_response_time": statistics.mean(response_times)
+                "average_response_time": average_response_time
             }
         }
     
@@ -421,7 +613,7 @@ class MealPlanEvaluator:
         score = 0.0
         
         # Response time score (30%)
-        avg_response_time = statistics.mean(response_times)
+        avg_response_time = sum(response_times) / len(response_times) if response_times else 0.0
         time_score = 1.0 if avg_response_time < 2.0 else max(0.0, 1.0 - (avg_response_time - 2.0) / 8.0)
         score += time_score * 0.3
         
@@ -457,7 +649,7 @@ class MealPlanEvaluator:
             "score": flow_score,
             "details": {
                 "input_messages": messages,
-                "responses": responses
+                **self._response_details(test_case, responses)
             }
         }
     
@@ -516,12 +708,16 @@ class MealPlanEvaluator:
                 }
             }
             
+        except CircuitOpenError:
+            # The request was never sent, so it says nothing about how the input is handled
+            raise
         except Exception as e:
             return {
                 "passed": expected_behavior == "should_error",
                 "score": 1.0 if expected_behavior == "should_error" else 0.0,
                 "details": {
                     "error": str(e),
+                    "error_type": type(e).__name__,
                     "expected_behavior": expected_behavior
                 }
             }
@@ -531,9 +727,9 @@ class MealPlanEvaluator:
         input_message = test_case.input_data["message"]
         max_response_time = test_case.expected_output.get("max_response_time", 5.0)
         
-        start_time = time.time()
+        start_time, throttled = time.perf_counter(), self._throttled_time()
         response = self._send_message(input_message)
-        response_time = time.time() - start_time
+        response_time = time.perf_counter() - start_time - (self._throttled_time() - throttled)
         
         # Performance score based on response time
         performance_score = 1.0 if response_time <= max_response_time else max(0.0, 1.0 - (response_time - max_response_time) / 10.0)
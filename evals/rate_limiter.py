@@ -0,0 +1,94 @@
+"""
+Rate limiting for concurrent evaluation runs
+
+Lets several tests be in flight at once while keeping the total number
+of requests (and, with TokenBucket, estimated LLM tokens) inside the API's
+per-minute quota.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+class RateLimiter:
+    """Thread-safe sliding-window limiter: at most max_rate acquires per time_period seconds"""
+
+    def __init__(self, max_rate: int, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._timestamps and now - self._timestamps[0] >= self.time_period:
+                    self._timestamps.popleft()
+
+                if len(self._timestamps) < self.max_rate:
+                    self._timestamps.append(now)
+                    return waited
+
+                wait_time = self.time_period - (now - self._timestamps[0])
+
+            time.sleep(wait_time)
+            waited += wait_time
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting requests per minute and estimated LLM tokens per minute
+
+    Both buckets refill continuously and start full, so short bursts go through
+    and sustained load settles at the configured rates. A limit of None is not
+    enforced. When one quota is split across several independent processes,
+    pass their number as executors and each bucket gets an equal share.
+    """
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None, executors: int = 1):
+        self.rpm = rpm / executors if rpm else None
+        self.tpm = tpm / executors if tpm else None
+        self.request_tokens = self.rpm or 0.0
+        self.token_tokens = self.tpm or 0.0
+        self.last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self.last_update
+        self.last_update = now
+        if self.rpm:
+            self.request_tokens = min(self.rpm, self.request_tokens + elapsed * self.rpm / 60.0)
+        if self.tpm:
+            self.token_tokens = min(self.tpm, self.token_tokens + elapsed * self.tpm / 60.0)
+
+    def acquire(self, n_tokens: int = 0) -> float:
+        """Block until one request of n_tokens may be sent; returns the seconds spent waiting"""
+        if self.tpm:
+            # A request larger than the whole bucket would otherwise wait forever
+            n_tokens = min(n_tokens, self.tpm)
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+
+                request_short = 1.0 - self.request_tokens if self.rpm else 0.0
+                token_short = n_tokens - self.token_tokens if self.tpm else 0.0
+                if request_short <= 0 and token_short <= 0:
+                    if self.rpm:
+                        self.request_tokens -= 1.0
+                    if self.tpm:
+                        self.token_tokens -= n_tokens
+                    return waited
+
+                wait_time = max(
+                    request_short * 60.0 / self.rpm if request_short > 0 else 0.0,
+                    token_short * 60.0 / self.tpm if token_short > 0 else 0.0
+                )
+
+            time.sleep(wait_time)
+            waited += wait_time
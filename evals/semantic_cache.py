@@ -0,0 +1,57 @@
+"""
+Near-duplicate response cache for evaluation runs
+
+Serves a stored /chat response when a conversation repeats one already sent
+up to case, spacing, punctuation and Unicode form. Anything beyond that is a
+miss: fuzzy text similarity can't tell "low-carb" from "high-carb" or
+"vegetarian" from "not vegetarian", and replaying the other conversation's
+answer would silently skew accuracy scores. So a changed word, a negation or
+a different number never matches.
+
+It is off unless benchmark.py is run with --semantic-cache.
+"""
+
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+_WORD = re.compile(r"\w+")
+
+
+class SemanticCache:
+    """In-memory cache keyed by the normalized text of every turn in the conversation"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(message: str, history: List[str]) -> Tuple[str, ...]:
+        """Each turn reduced to its words: NFKC-folded, casefolded, punctuation and spacing dropped"""
+        return tuple(
+            " ".join(_WORD.findall(unicodedata.normalize("NFKC", turn).casefold()))
+            for turn in [*history, message]
+        )
+
+    def get(self, message: str, history: List[str]) -> Optional[Dict[str, Any]]:
+        key = self._normalize(message, history)
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return response
+
+    def put(self, message: str, history: List[str], response: Dict[str, Any]):
+        """Store response for the conversation, keeping the first one if it is already cached"""
+        key = self._normalize(message, history)
+        with self._lock:
+            self._entries.setdefault(key, response)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -5,6 +5,13 @@ This module contains comprehensive test cases covering various scenarios
 including normal usage, edge cases, safety compliance, and performance testing.
 """
 
+from collections import defaultdict
+from dataclasses import replace
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
+from typing import Optional
+
 from .evaluator import TestCase, EvalCategory
 
 
@@ -588,32 +595,85 @@ def get_performance_test_cases():
     ]
 
 
+_BUILDERS = {
+    EvalCategory.DATA_EXTRACTION: get_data_extraction_test_cases,
+    EvalCategory.MEAL_PLAN_QUALITY: get_meal_plan_quality_test_cases,
+    EvalCategory.SAFETY_COMPLIANCE: get_safety_compliance_test_cases,
+    EvalCategory.USER_EXPERIENCE: get_user_experience_test_cases,
+    EvalCategory.CONVERSATION_FLOW: get_conversation_flow_test_cases,
+    EvalCategory.EDGE_CASES: get_edge_case_test_cases,
+    EvalCategory.PERFORMANCE: get_performance_test_cases,
+}
+
+
 def get_all_test_cases():
     """Get all test cases organized by category"""
-    all_test_cases = []
-    
-    # Add all test case categories
-    all_test_cases.extend(get_data_extraction_test_cases())
-    all_test_cases.extend(get_meal_plan_quality_test_cases())
-    all_test_cases.extend(get_safety_compliance_test_cases())
-    all_test_cases.extend(get_user_experience_test_cases())
-    all_test_cases.extend(get_conversation_flow_test_cases())
-    all_test_cases.extend(get_edge_case_test_cases())
-    all_test_cases.extend(get_performance_test_cases())
-    
-    return all_test_cases
+    return list(_all_test_cases())
+
+
+def _freeze(value):
+    """Read-only copy of nested test data: dicts become mapping proxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _frozen_case(case):
+    """The case with its data frozen, so the cached instance can be shared between workers"""
+    return replace(
+        case,
+        input_data=_freeze(case.input_data),
+        expected_output=_freeze(case.expected_output),
+        evaluation_criteria=tuple(case.evaluation_criteria),
+        tags=tuple(case.tags),
+    )
+
+
+@lru_cache(maxsize=None)
+def _category_test_cases(category: EvalCategory):
+    """Build one category's test cases once, leaving the other categories unbuilt"""
+    return tuple(_frozen_case(case) for case in _BUILDERS[category]())
+
+
+@lru_cache(maxsize=None)
+def _all_test_cases():
+    """Build the test cases once; callers get their own list of the shared cases"""
+    return tuple(case for category in _BUILDERS for case in _category_test_cases(category))
+
+
+def iter_test_cases(category: Optional[EvalCategory] = None, priority: Optional[str] = None):
+    """Yield test cases lazily, optionally filtered by category and/or priority
+
+    Only the requested category is built, so a filtered run (or a
+    ``pytest.mark.parametrize`` source) never constructs the others.
+    """
+    categories = (category,) if category is not None else _BUILDERS
+    for selected in categories:
+        for case in _category_test_cases(selected):
+            if priority is None or case.priority == priority:
+                yield case
+
+
+@lru_cache(maxsize=None)
+def _test_case_index(*attributes: str):
+    """The cached test cases grouped by TestCase attributes (a tuple key for several), built on first use"""
+    key = attrgetter(*attributes)
+    index = defaultdict(list)
+    for case in _all_test_cases():
+        index[key(case)].append(case)
+    return {value: tuple(cases) for value, cases in index.items()}
 
 
 def get_test_cases_by_category(category: EvalCategory):
     """Get test cases filtered by category"""
-    all_cases = get_all_test_cases()
-    return [case for case in all_cases if case.category == category]
+    return list(_category_test_cases(category))
 
 
 def get_test_cases_by_priority(priority: str):
     """Get test cases filtered by priority level"""
-    all_cases = get_all_test_cases()
-    return [case for case in all_cases if case.priority == priority]
+    return list(_test_case_index("priority").get(priority, ()))
 
 
 def get_critical_test_cases():
@@ -621,15 +681,25 @@ def get_critical_test_cases():
     return get_test_cases_by_priority("critical")
 
 
+_SMOKE_PICKS = (
+    # One from each category
+    (EvalCategory.DATA_EXTRACTION, "high"),
+    (EvalCategory.MEAL_PLAN_QUALITY, "critical"),
+    (EvalCategory.SAFETY_COMPLIANCE, "critical"),
+    (EvalCategory.USER_EXPERIENCE, "high"),
+    (EvalCategory.CONVERSATION_FLOW, "high"),
+    (EvalCategory.EDGE_CASES, "medium"),
+    (EvalCategory.PERFORMANCE, "medium"),
+)
+
+
+@lru_cache(maxsize=None)
+def _smoke_test_cases():
+    """Pick the smoke cases once from the (category, priority) index"""
+    by_category_priority = _test_case_index("category", "priority")
+    return tuple(by_category_priority[pick][0] for pick in _SMOKE_PICKS)
+
+
 def get_smoke_test_cases():
     """Get a small subset of test cases for smoke testing"""
-    return [
-        # One from each category
-        next(case for case in get_data_extraction_test_cases() if case.priority == "high"),
-        next(case for case in get_meal_plan_quality_test_cases() if case.priority == "critical"),
-        next(case for case in get_safety_compliance_test_cases() if case.priority == "critical"),
-        next(case for case in get_user_experience_test_cases() if case.priority == "high"),
-        next(case for case in get_conversation_flow_test_cases() if case.priority == "high"),
-        next(case for case in get_edge_case_test_cases() if case.priority == "medium"),
-        next(case for case in get_performance_test_cases() if case.priority == "medium"),
-    ]
+    return list(_smoke_test_cases())
@@ -15,11 +15,14 @@ Options:
     --output-dir DIR        Directory for output reports (default: eval_reports)
     --base-url URL          Base URL for the application (default: http://localhost:5000)
     --format FORMAT         Report format: html, csv, json, all (default: html)
+    --workers N             Number of tests to run concurrently (default: 4)
+    --skip-health-check     Don't probe the application before running tests
     --verbose              Enable verbose output
     --help                  Show this help message
 """
 
 import argparse
+import json
 import sys
 import time
 from pathlib import Path
@@ -27,15 +30,45 @@ from pathlib import Path
 # Add the project root to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from evals.evaluator import MealPlanEvaluator, EvalCategory
-from evals.test_cases import (
-    get_all_test_cases, 
-    get_test_cases_by_category, 
-    get_test_cases_by_priority,
-    get_critical_test_cases,
-    get_smoke_test_cases
+# A passing readiness probe is trusted for this long across invocations
+HEALTH_CACHE_TTL = 30.0
+
+# (minimum pass rate, exit code, verdict), best tier first
+PASS_RATE_TIERS = (
+    (0.9, 0, "🎉 Excellent! All systems performing well."),
+    (0.8, 0, "👍 Good performance with room for improvement."),
+    (0.7, 1, "⚠️  Acceptable performance but needs attention."),
+    (0.0, 1, "🚨 Poor performance - immediate attention required."),
 )
-from evals.reporter import EvaluationReporter
+
+
+def check_readiness(adapter, base_url, cache_path):
+    """Probe the application's /readyz endpoint, returning its status code
+
+    A 200 is remembered in cache_path, and later calls against the same base URL
+    within HEALTH_CACHE_TTL seconds return 200 without sending a request.
+    The probe goes through adapter's connection pool (the evaluator's), so the
+    tests start on a warm connection, but is sent once without the adapter's
+    retries: a 503 from an app that is up but not ready comes back at once.
+    Connection errors propagate to the caller.
+    """
+    try:
+        cached = json.loads(cache_path.read_text())
+        if cached.get("base_url") == base_url and time.time() - cached["ts"] < HEALTH_CACHE_TTL:
+            return 200
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    
+    status = adapter.poolmanager.request(
+        "GET", f"{base_url.rstrip('/')}/readyz", retries=False, redirect=False, timeout=2.0
+    ).status
+    if status == 200:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(json.dumps({"base_url": base_url, "ts": time.time()}))
+        except OSError:
+            pass
+    return status
 
 
 def main():
@@ -52,9 +85,10 @@ Examples:
         """
     )
     
+    # Checked against EvalCategory after parsing, so --help doesn't import the evals package
     parser.add_argument(
         '--category', 
-        choices=[cat.value for cat in EvalCategory],
+        metavar='CATEGORY',
         help='Run tests for specific category only'
     )
     
@@ -89,6 +123,19 @@ Examples:
         help='Report format (default: html)'
     )
     
+    parser.add_argument(
+        '--workers', 
+        type=int,
+        default=4,
+        help='Number of tests to run concurrently (default: 4)'
+    )
+    
+    parser.add_argument(
+        '--skip-health-check', 
+        action='store_true',
+        help="Don't probe the application before running tests"
+    )
+    
     parser.add_argument(
         '--verbose', 
         action='store_true',
@@ -97,8 +144,24 @@ Examples:
     
     args = parser.parse_args()
     
+    from evals.evaluator import MealPlanEvaluator, EvalCategory
+    from evals.test_cases import (
+        get_all_test_cases, 
+        get_test_cases_by_category, 
+        get_test_cases_by_priority,
+        get_smoke_test_cases
+    )
+    from evals.reporter import EvaluationReporter
+    
+    category_choices = [cat.value for cat in EvalCategory]
+    if args.category is not None and args.category not in category_choices:
+        parser.error(
+            f"argument --category: invalid choice: {args.category!r} "
+            f"(choose from {', '.join(map(repr, category_choices))})"
+        )
+    
     # Initialize evaluator and reporter
-    evaluator = MealPlanEvaluator(base_url=args.base_url)
+    evaluator = MealPlanEvaluator(base_url=args.base_url, max_workers=max(1, args.workers))
     reporter = EvaluationReporter(output_dir=args.output_dir)
     
     # Select test cases based on arguments
@@ -126,30 +189,46 @@ Examples:
     print(f"🌐 Base URL: {args.base_url}")
     print(f"📁 Output Directory: {args.output_dir}")
     print(f"📊 Report Format: {args.format}")
+    print(f"🧵 Workers: {evaluator.max_workers}")
     print("-" * 60)
     
     # Test connection to the application
-    try:
-        import requests
-        response = requests.get(args.base_url, timeout=5)
-        if response.status_code != 200:
-            print(f"⚠️  Warning: Application at {args.base_url} returned status {response.status_code}")
-    except Exception as e:
-        print(f"❌ Cannot connect to application at {args.base_url}: {e}")
-        print("   Please ensure the application is running before starting evaluations.")
-        return 1
+    if not args.skip_health_check:
+        try:
+            status = check_readiness(
+                evaluator.adapter, args.base_url, Path(args.output_dir) / '.health_cache.json'
+            )
+            if status != 200:
+                print(f"⚠️  Warning: Application at {args.base_url} returned readiness status {status}")
+        except Exception as e:
+            print(f"❌ Cannot connect to application at {args.base_url}: {e}")
+            print("   Please ensure the application is running before starting evaluations.")
+            return 1
     
     # Run evaluations
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
-        suite = evaluator.run_evaluation_suite(test_cases)
+        on_result = None
+        if sys.stdout.isatty():
+            # Redraw one progress line in place so a slow run can be told from a hung one
+            done = 0
+            
+            def show_progress(result):
+                nonlocal done
+                done += 1
+                sys.stdout.write(f"\r⏳ {done}/{len(test_cases)} tests run (last: {result.test_case_id})   ")
+                sys.stdout.flush()
+            
+            on_result = show_progress
+        
+        suite = evaluator.run_evaluation_suite(test_cases, on_result=on_result)
         
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         
         # Print summary
         print(f"\n📊 Evaluation Complete!")
-        print(f"⏱️  Total Time: {total_time:.1f}s")
+        print(f"⏱️  Evaluation Time: {total_time:.1f}s")
         print(f"✅ Passed: {suite.passed_tests}/{suite.total_tests} ({suite.pass_rate:.1%})")
         print(f"❌ Failed: {suite.failed_tests}")
         print(f"🎯 Average Score: {suite.average_score:.2f}")
@@ -157,32 +236,25 @@ Examples:
         # Show failed tests if any
         failed_tests = [r for r in suite.results if not r.passed]
         if failed_tests:
-            print(f"\n❌ Failed Tests ({len(failed_tests)}):")
+            # Collect the listing and write it in one go rather than a line at a time
+            lines = [f"\n❌ Failed Tests ({len(failed_tests)}):"]
             for test in failed_tests:
-                print(f"   - {test.test_case_id}: Score {test.score:.2f}")
+                lines.append(f"   - {test.test_case_id}: Score {test.score:.2f}")
                 if test.errors and args.verbose:
-                    for error in test.errors[:2]:  # Show first 2 errors
-                        print(f"     Error: {error}")
+                    lines.extend(f"     Error: {error}" for error in test.errors[:2])  # Show first 2 errors
+            print("\n".join(lines))
         
         # Generate reports
         print(f"\n📄 Generating Reports...")
+        report_start = time.perf_counter()
         
-        report_files = []
-        
-        if args.format in ['html', 'all']:
-            html_file = reporter.generate_html_report(suite)
-            report_files.append(html_file)
-            print(f"📝 HTML Report: {html_file}")
+        formats = ('html', 'csv', 'json') if args.format == 'all' else (args.format,)
+        report_files = reporter.generate_all_reports(suite, formats)
         
-        if args.format in ['csv', 'all']:
-            csv_file = reporter.generate_csv_report(suite)
-            report_files.append(csv_file)
-            print(f"📊 CSV Report: {csv_file}")
-        
-        if args.format in ['json', 'all']:
-            json_file = reporter.generate_json_report(suite)
-            report_files.append(json_file)
-            print(f"📋 JSON Report: {json_file}")
+        report_labels = {'html': '📝 HTML Report', 'csv': '📊 CSV Report', 'json': '📋 JSON Report'}
+        for report_format, report_file in report_files.items():
+            print(f"{report_labels[report_format]}: {report_file}")
+        print(f"⏱️  Report Time: {time.perf_counter() - report_start:.2f}s")
         
         # Generate summary to console
         if args.verbose:
@@ -190,18 +262,10 @@ Examples:
             print(reporter.generate_summary_report(suite))
         
         # Return exit code based on pass rate
-        if suite.pass_rate >= 0.9:
-            print(f"\n🎉 Excellent! All systems performing well.")
-            return 0
-        elif suite.pass_rate >= 0.8:
-            print(f"\n👍 Good performance with room for improvement.")
-            return 0
-        elif suite.pass_rate >= 0.7:
-            print(f"\n⚠️  Acceptable performance but needs attention.")
-            return 1
-        else:
-            print(f"\n🚨 Poor performance - immediate attention required.")
-            return 1
+        for threshold, exit_code, message in PASS_RATE_TIERS:
+            if suite.pass_rate >= threshold:
+                print(f"\n{message}")
+                return exit_code
             
     except KeyboardInterrupt:
         print(f"\n🛑 Evaluation interrupted by user.")
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """
 Test script to verify the application works with existing dependencies
+
+Pass --deep to also import each package rather than only reading its metadata.
 """
 import sys
 import os
@@ -8,25 +10,38 @@ import os
 # Add the project directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def test_imports():
-    """Test if we can import all required modules"""
-    try:
-        import flask
-        print(f"✓ Flask version: {flask.__version__}")
-        
-        import google.genai
-        print("✓ Google GenAI imported successfully")
-        
-        import pydantic
-        print(f"✓ Pydantic version: {pydantic.__version__}")
-        
-        from pydantic import BaseModel
-        print("✓ Pydantic BaseModel imported successfully")
+# Distribution name -> module to import for a --deep check
+REQUIRED_PACKAGES = {
+    "flask": "flask",
+    "google-genai": "google.genai",
+    "pydantic": "pydantic",
+}
+
+def test_imports(deep=False):
+    """Test that all required packages are installed
+
+    Versions come from the installed package metadata, without importing
+    anything; with deep=True each package is also imported to check it loads.
+    """
+    import importlib
+    from importlib.metadata import version, PackageNotFoundError
+    
+    for name, module in REQUIRED_PACKAGES.items():
+        try:
+            print(f"✓ {name} version: {version(name)}")
+        except PackageNotFoundError:
+            print(f"✗ {name} is not installed")
+            return False
         
-        return True
-    except ImportError as e:
-        print(f"✗ Import error: {e}")
-        return False
+        if deep:
+            try:
+                importlib.import_module(module)
+            except ImportError as e:
+                print(f"✗ Import error: {e}")
+                return False
+            print(f"✓ {module} imported successfully")
+    
+    return True
 
 def test_environment():
     """Test environment setup"""
@@ -42,7 +57,7 @@ if __name__ == "__main__":
     print("Testing AI Meal Plan Assistant dependencies...")
     print("=" * 50)
     
-    if test_imports() and test_environment():
+    if test_imports(deep="--deep" in sys.argv[1:]) and test_environment():
         print("\n✓ All tests passed! You can run the application.")
         print("\nTo run the app:")
         print("1. Set your GEMINI_API_KEY environment variable")
@@ -0,0 +1,64 @@
+"""
+Tests for the near-duplicate response cache
+
+Run with: python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from evals.semantic_cache import SemanticCache
+
+RESPONSE = {"type": "meal_plan", "meal_plan": {"breakfast": "oats"}}
+
+
+def cache_with(message, history=()):
+    cache = SemanticCache()
+    cache.put(message, list(history), RESPONSE)
+    return cache
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("I'm vegetarian and want to lose weight", "i'm  VEGETARIAN, and want to lose weight!"),
+    ("Low-carb please", "low carb please"),
+    ("I’m 45 years old", "I’m 45 years old."),
+])
+def test_rewording_of_case_spacing_and_punctuation_hits(stored, asked):
+    cache = cache_with(stored)
+    assert cache.get(asked, []) is RESPONSE
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+@pytest.mark.parametrize("stored, asked", [
+    ("I follow a low-carb diet", "I follow a high-carb diet"),
+    ("I'm vegetarian and want to lose weight", "I'm not vegetarian and want to gain weight"),
+    ("I'm vegetarian", "I'm not vegetarian"),
+    ("I can eat dairy", "I can't eat dairy"),
+    ("I'm 45 years old", "I'm 54 years old"),
+    ("Keep it under 1500 calories", "Keep it under 2500 calories"),
+    ("I like mushrooms", "I dislike mushrooms"),
+])
+def test_opposite_or_different_meaning_misses(stored, asked):
+    cache = cache_with(stored)
+    assert cache.get(asked, []) is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_history_is_part_of_the_key():
+    cache = cache_with("Please proceed with the meal plan.", ["I have diabetes"])
+    assert cache.get("Please proceed with the meal plan.", ["I have diabetes"]) is RESPONSE
+    assert cache.get("Please proceed with the meal plan.", ["I don't have diabetes"]) is None
+    assert cache.get("Please proceed with the meal plan.", []) is None
+
+
+def test_put_keeps_the_first_entry():
+    cache = cache_with("I like fish")
+    cache.put("i like fish.", [], {"type": "meal_plan", "meal_plan": {}})
+    cache.put("I like fish", [], RESPONSE)
+    assert len(cache) == 1
+    assert cache.get("I like fish", []) is RESPONSE